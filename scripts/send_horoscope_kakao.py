@@ -1,18 +1,37 @@
 # send_taurus_horoscope_kakao.py
 import os
 import json
+import atexit
+import asyncio
+import functools
+import httpx
+import orjson
 import requests
-import pandas as pd
+from pathlib import Path
 from datetime import datetime, timezone, timedelta
 from typing import Optional
 
 # 당신의 크롤러 모듈 (앱에서 쓰던 것과 동일)
-from 오하아사_크롤링 import get_zodiak_data
+from 오하아사_크롤링 import get_zodiak_dict_async
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # --- Kakao OAuth/Message endpoints ---
 TOKEN_URL = "https://kauth.kakao.com/oauth/token"
 MEMO_SEND_URL = "https://kapi.kakao.com/v2/api/talk/memo/default/send"
 
+# keep-alive 세션: 토큰 갱신/메시지 전송이 TCP+TLS 핸드셰이크를 공유하고,
+# 일시적 5xx/429엔 자동 재시도 (스케줄 잡 안정성)
+_session = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=4,
+    max_retries=Retry(total=3, backoff_factor=0.3,
+                      status_forcelist=[429, 500, 502, 503, 504]),
+)
+_session.mount("https://", _adapter)
+
 # --- 환경변수 (GitHub Actions 등에서 Secrets로 설정 권장) ---
 # 필수
 KAKAO_CLIENT_ID = os.getenv("KAKAO_CLIENT_ID")            # 카카오 REST API 키
@@ -25,18 +44,124 @@ assert KAKAO_CLIENT_ID and KAKAO_REFRESH_TOKEN, "KAKAO_CLIENT_ID / KAKAO_REFRESH
 # --- 번역기 (deep-translator 사용, Python 3.13 호환) ---
 from deep_translator import MyMemoryTranslator
 
+# 번역기 인스턴스는 대상 언어별 1회만 생성 (호출마다 언어 테이블 초기화 방지)
+@functools.lru_cache(maxsize=4)
+def _get_translator(target: str) -> MyMemoryTranslator:
+    return MyMemoryTranslator(source="japanese", target=target)
+
+# 행운의 색/물건은 날마다 겹치므로 디스크 캐시로 중복 요청 제거
+_TR_CACHE_PATH = Path.home() / ".cache" / "horoscope_tr.json"
+
+def _load_tr_cache() -> dict:
+    try:
+        return json.loads(_TR_CACHE_PATH.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+
+_TR_CACHE = _load_tr_cache()
+
+def _save_tr_cache():
+    try:
+        _TR_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        _TR_CACHE_PATH.write_text(
+            json.dumps(_TR_CACHE, ensure_ascii=False), encoding="utf-8"
+        )
+    except Exception as e:
+        print(f"[WARN] 번역 캐시 저장 실패: {e}")
+
+atexit.register(_save_tr_cache)
+
+@functools.lru_cache(maxsize=4096)
+def _translate_cached(text: str, target: str) -> str:
+    """같은 프로세스 안에서의 중복 호출까지 메모이즈."""
+    return _get_translator(target).translate(text).strip()
+
 def translate_text(text: str, target_language="korean") -> str:
-    """MyMemory 무료 번역 (일본어→한국어)"""
+    """MyMemory 무료 번역 (일본어→한국어). 캐시 히트 시 네트워크 요청 없음."""
     if not text or not isinstance(text, str):
         return text
+    cache_key = f"ja|{target_language}|{text}"
+    cached = _TR_CACHE.get(cache_key)
+    if cached:
+        return cached
     try:
-        translated = MyMemoryTranslator(source="japanese", target=target_language).translate(text)
-        return translated.strip()
+        translated = _translate_cached(text, target_language)
+        _TR_CACHE[cache_key] = translated
+        return translated
     except Exception as e:
         print(f"[WARN] 번역 실패 ({text[:10]}...): {e}")
         return text
 
 
+# MyMemory REST 엔드포인트 (deep_translator의 블로킹 requests 호출 우회)
+_MYMEMORY_URL = "https://api.mymemory.translated.net/get"
+# de= 이메일을 넣으면 MyMemory 일일 문자 쿼터가 늘어남 (선택)
+_MYMEMORY_EMAIL = os.getenv("MYMEMORY_EMAIL")
+
+async def _translate_all(texts: list[str], target_language="korean") -> list[str]:
+    """여러 텍스트를 MyMemory REST 요청 1건으로 일괄 번역. 캐시 미스만 요청한다."""
+    results: dict[str, str] = {}
+    misses: list[str] = []
+    for t in texts:
+        if not t or not isinstance(t, str):
+            continue
+        cached = _TR_CACHE.get(f"ja|{target_language}|{t}")
+        if cached:
+            results[t] = cached
+        elif t not in misses:
+            misses.append(t)
+
+    if misses:
+        async with httpx.AsyncClient(timeout=15) as client:
+            items = None
+            # multi-q: q를 반복해 실어 한 번의 왕복으로 모두 번역
+            params = [("langpair", "ja|ko")] + [("q", t) for t in misses]
+            if _MYMEMORY_EMAIL:
+                params.append(("de", _MYMEMORY_EMAIL))
+            try:
+                res = await client.get(_MYMEMORY_URL, params=params)
+                res.raise_for_status()
+                data = res.json()
+                # q가 1개면 dict, 여러 개면 배열(위치 순서 유지)로 응답
+                items = data if isinstance(data, list) else [data]
+                if len(items) != len(misses):
+                    # 개수가 어긋난 응답을 위치로 짝지으면 엉뚱한 번역 쌍이
+                    # 디스크 캐시까지 오염됨 → 개별 요청 폴백으로 전환
+                    items = None
+            except Exception as e:
+                print(f"[WARN] 일괄 번역 실패 ({len(misses)}건): {e}")
+
+            if items is None:
+                # 폴백: 텍스트별 개별 요청을 동시 실행
+                responses = await asyncio.gather(
+                    *(client.get(_MYMEMORY_URL, params={"q": t, "langpair": "ja|ko"})
+                      for t in misses),
+                    return_exceptions=True,
+                )
+                items = []
+                for r in responses:
+                    if isinstance(r, Exception):
+                        items.append(r)
+                        continue
+                    try:
+                        r.raise_for_status()
+                        items.append(r.json())
+                    except Exception as e:
+                        items.append(e)
+
+        for t, item in zip(misses, items):
+            try:
+                if isinstance(item, Exception):
+                    raise item
+                translated = item["responseData"]["translatedText"].strip()
+                results[t] = translated
+                _TR_CACHE[f"ja|{target_language}|{t}"] = translated
+            except Exception as e:
+                print(f"[WARN] 번역 실패 ({t[:10]}...): {e}")
+
+    return [results.get(t, t) for t in texts]
+
+
 # -------------------------------
 # Kakao API: 토큰 갱신/메시지 전송
 # -------------------------------
@@ -47,7 +172,23 @@ def refresh_access_token() -> str:
         "client_id": KAKAO_CLIENT_ID,
         "refresh_token": KAKAO_REFRESH_TOKEN,
     }
-    res = requests.post(TOKEN_URL, data=data, timeout=15)
+    res = _session.post(TOKEN_URL, data=data, timeout=15)
+    res.raise_for_status()
+    js = res.json()
+    access = js.get("access_token")
+    if not access:
+        raise RuntimeError(f"토큰 갱신 실패: {js}")
+    return access
+
+async def refresh_access_token_async() -> str:
+    """refresh_access_token의 async 버전 (크롤링과 동시 실행용)."""
+    data = {
+        "grant_type": "refresh_token",
+        "client_id": KAKAO_CLIENT_ID,
+        "refresh_token": KAKAO_REFRESH_TOKEN,
+    }
+    async with httpx.AsyncClient(timeout=15) as client:
+        res = await client.post(TOKEN_URL, data=data)
     res.raise_for_status()
     js = res.json()
     access = js.get("access_token")
@@ -63,8 +204,9 @@ def send_kakao_memo(access_token: str, text: str, web_url: Optional[str] = None)
         "text": text,
         "link": {"web_url": web_url or "https://www.kakao.com"},
     }
-    payload = {"template_object": json.dumps(template_obj, ensure_ascii=False)}
-    res = requests.post(MEMO_SEND_URL, headers=headers, data=payload, timeout=15)
+    # orjson은 ASCII 이스케이프 없이 항상 유효한 UTF-8을 내보냄 (한글 그대로)
+    payload = {"template_object": orjson.dumps(template_obj).decode()}
+    res = _session.post(MEMO_SEND_URL, headers=headers, data=payload, timeout=15)
     try:
         return res.json()
     except Exception:
@@ -73,16 +215,19 @@ def send_kakao_memo(access_token: str, text: str, web_url: Optional[str] = None)
 # -------------------------------
 # 메시지 빌드 유틸
 # -------------------------------
+# 0~5점 표기 룩업 테이블 (0 이하는 '-')
+_STARS = ("-", "★", "★★", "★★★", "★★★★", "★★★★★")
+
 def stars(n: int) -> str:
     """정수 점수를 문자 별(★)로 표기. 0 이하면 '-'"""
     try:
         n = int(n)
     except Exception:
         n = 0
-    return "★" * n if n > 0 else "-"
+    return _STARS[n] if 0 <= n < len(_STARS) else ("★" * n if n > 0 else "-")
 
-def build_message_from_row(row: pd.Series) -> tuple[str, Optional[str]]:
-    """크롤링 행으로부터 카카오 메시지 본문/링크 생성"""
+def build_message_from_row(row: dict) -> tuple[str, Optional[str]]:
+    """크롤링 행(dict)으로부터 카카오 메시지 본문/링크 생성"""
     # 한국시간 날짜 표기
     kst = timezone(timedelta(hours=9))
     today = datetime.now(kst).strftime("%Y-%m-%d")
@@ -109,33 +254,30 @@ def build_message_from_row(row: pd.Series) -> tuple[str, Optional[str]]:
 # -------------------------------
 # 메인
 # -------------------------------
-def main():
-    # 1) 데이터 수집 (당신의 크롤러)
-    df = get_zodiak_data(headless=True)
-
-    # 2) 필요한 컬럼만 남기고 정렬(선택)
-    cols_order = ["순위", "별자리", "운세", "행운의 색", "행운의 물건", "금전", "애정", "업무", "건강", "링크"]
-    df = df[[c for c in cols_order if c in df.columns]].copy()
+async def _crawl_and_refresh(target: str):
+    """크롤링과 카카오 토큰 갱신을 겹쳐 실행 (둘 중 느린 쪽 시간만 소요)."""
+    return await asyncio.gather(
+        get_zodiak_dict_async(target, headless=True),
+        refresh_access_token_async(),
+    )
 
-    # 3) 황소자리 선택 (별자리명은 크롤링 결과에 맞춰 정확히)
+def main():
+    # 1) 데이터 수집(황소자리 1건) + 카카오 토큰 갱신 동시 실행
     target = "황소자리"
-    sel = df.loc[df["별자리"] == target]
-    if sel.empty:
-        raise RuntimeError("크롤링 데이터에 '황소자리'가 없습니다.")
+    row, access = asyncio.run(_crawl_and_refresh(target))
 
-    # 4) 선택된 행(row)만 번역 (일본어 -> 한국어)
-    row = sel.iloc[0].copy()
-    for col in ["운세", "행운의 색", "행운의 물건"]:
-        if col in row and pd.notna(row[col]):
-            row[col] = translate_text(row[col])
+    # 2) 선택된 행(row)만 번역 (일본어 -> 한국어, 3개 컬럼 동시 요청)
+    tr_cols = [c for c in ["운세", "행운의 색", "행운의 물건"] if row.get(c)]
+    translated = asyncio.run(_translate_all([row[c] for c in tr_cols]))
+    for col, tr in zip(tr_cols, translated):
+        row[col] = tr
 
     text, web_url = build_message_from_row(row)
-    
-    # 5) 카카오 Access Token 갱신 → 메시지 전송
-    access = refresh_access_token()
+
+    # 3) 메시지 전송
     res = send_kakao_memo(access, text, web_url)
 
-    # 6) 결과 로그 (result_code == 0 이면 성공)
+    # 4) 결과 로그 (result_code == 0 이면 성공)
     print("Kakao response:", res)
 
 if __name__ == "__main__":
@@ -1,128 +1,288 @@
 # crawler.py
-import time
-import pandas as pd
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+from __future__ import annotations
+
+import asyncio
+import re
+from types import MappingProxyType
+
+import httpx
+import orjson
+from selectolax.parser import HTMLParser
 
 URL = "https://www.tv-asahi.co.jp/yajiplus/uranai/#ousi"
 BASE_URL = "https://www.tv-asahi.co.jp/yajiplus/uranai/"
 
-# ---- 내부 유틸 ----
-def _build_driver(headless: bool = True) -> webdriver.Chrome:
-    chrome_options = webdriver.ChromeOptions()
-    if headless:
-        chrome_options.add_argument("--headless=new")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--window-size=1280,800")
-    return webdriver.Chrome(
-        service=Service(ChromeDriverManager().install()),
-        options=chrome_options
+# 정적 GET용 UA (봇 차단 회피용 일반 브라우저 UA)
+_UA_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
     )
+}
+
+# 별자리 매핑 (파싱 함수들 공용, import 시 1회 구성 + 읽기 전용 동결)
+_ZODIAK_KR_JP = MappingProxyType({
+    "양자리": "おひつじ座", "황소자리": "おうし座", "쌍둥이자리": "ふたご座",
+    "게자리": "かに座", "사자자리": "しし座", "처녀자리": "おとめ座",
+    "천칭자리": "てんびん座", "전갈자리": "さそり座", "궁수자리": "いて座",
+    "염소자리": "やぎ座", "물병자리": "みずがめ座", "물고기자리": "うお座",
+})
+_JP_TO_KR = MappingProxyType({v: k for k, v in _ZODIAK_KR_JP.items()})
+_EID_TO_KR = MappingProxyType({
+    "ohitsuji": "양자리", "ousi": "황소자리", "futago": "쌍둥이자리",
+    "kani": "게자리", "sisi": "사자자리", "otome": "처녀자리",
+    "tenbin": "천칭자리", "sasori": "전갈자리", "ite": "궁수자리",
+    "yagi": "염소자리", "mizugame": "물병자리", "uo": "물고기자리",
+})
+_KR_TO_EID = MappingProxyType({v: k for k, v in _EID_TO_KR.items()})
+
+# CSS 셀렉터 상수 (모듈 로드 시 1회 구성, selectolax가 C 레벨에서 매칭)
+_SEL_RANK_BOX = "ul.rank-box"
+_SEL_SEIZA_AREA = "div.seiza-area"
+_SEL_SEIZA_BOX = "div.seiza-box"
+_SEL_READ_AREA = "div.read-area"
+_SEL_READ = "p.read"
+_SEL_SCORE_BOX = "div.number-one-box"
+_SEL_LABEL_SPAN = {
+    cls: f"span.{cls}" for cls in ("lucky-color-txt", "key-txt")
+}
+_SEL_STAR_IMGS = {
+    cls: f"li.{cls} p.lucky-box img"
+    for cls in ("lucky-money", "lucky-love", "lucky-work", "lucky-health")
+}
+
+
+# ---- 내부 유틸 ----
+# 브라우저 폴백용 Chrome 인자: 쓰지 않는 서브시스템/서브리소스 차단
+# (파싱엔 DOM 구조만 필요 — 별 개수도 <img> 노드 수로 셈)
+_BROWSER_ARGS = (
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--disable-background-networking",
+    "--disable-sync",
+    "--disable-translate",
+    "--disable-default-apps",
+    "--disable-extensions",
+    "--disable-component-update",
+    "--mute-audio",
+    "--disable-features=Translate,BackForwardCache,OptimizationHints,MediaRouter",
+    "--disable-background-timer-throttling",
+    "--disable-renderer-backgrounding",
+    "--blink-settings=imagesEnabled=false",
+)
+
+
+async def _fetch_html_browser(url: str = URL, headless: bool = True) -> str:
+    """CDP(zendriver) 기반 브라우저 폴백.
+
+    Chrome DevTools WebSocket에 직접 붙으므로 WebDriver 프로토콜 왕복도,
+    드라이버 바이너리 관리도 없고, WebDriver 계열 봇 탐지 표면도 피한다.
+    """
+    import zendriver as zd  # 폴백 경로에서만 쓰므로 지연 import
+
+    browser = await zd.start(headless=headless, browser_args=list(_BROWSER_ARGS))
+    try:
+        page = await browser.get(url)
+        # 고정 sleep 대신 파싱 대상이 나타날 때까지만 대기
+        await page.wait_for("ul.rank-box li", timeout=10)
+        return await page.get_content()
+    finally:
+        await browser.stop()
+
+
+# 인라인 구조화 데이터 탐색용 (모듈 로드 시 1회 컴파일)
+_RE_LDJSON = re.compile(
+    r'<script[^>]*type=["\']application/ld\+json["\'][^>]*>(.*?)</script>', re.S
+)
+_RE_STATE = re.compile(r"window\.__[A-Z_]+__\s*=\s*({.*?});", re.S)
+
+
+def _find_inline_json(html: str) -> list:
+    """페이지에 심어진 JSON-LD / window.__STATE__류 블롭을 전부 파싱해 반환."""
+    blobs = []
+    for pattern in (_RE_LDJSON, _RE_STATE):
+        for m in pattern.finditer(html):
+            try:
+                blobs.append(orjson.loads(m.group(1)))
+            except orjson.JSONDecodeError:
+                continue
+    return blobs
+
+
+def _rows_from_inline_json(html: str) -> list | None:
+    """인라인 JSON에 별자리 데이터가 통째로 있으면 DOM 탐색 없이 행 목록을 만든다.
+
+    현재 tv-asahi 페이지는 서버 렌더링 HTML만 제공하므로 보통 None이지만,
+    구조화 데이터가 추가되면 DOM 탐색 경로보다 훨씬 싸게 처리된다.
+    """
+    for blob in _find_inline_json(html):
+        if not isinstance(blob, dict):
+            continue
+        if not all(zid in blob for zid in zodiak_eng_ids()):
+            continue
+        rows = []
+        for zid in zodiak_eng_ids():
+            entry = blob[zid]
+            if not isinstance(entry, dict) or "read" not in entry:
+                break
+            rows.append({"id": zid, **entry})
+        else:
+            return rows
+    return None
+
+
+def zodiak_eng_ids() -> tuple:
+    return tuple(_EID_TO_KR)
+
+
+def _has_expected_structure(html: str) -> bool:
+    """정적 HTML에 파싱 대상(rank-box/seiza-area)이 포함돼 있는지 확인."""
+    return "rank-box" in html and "seiza-area" in html
 
 def _text_after_label(parent, label_cls: str) -> str:
     """
     <span class="label_cls">ラベル</span>：テキ스트
     같은 구조에서, 라벨 span 다음에 오는 텍스트 노드를 깔끔히 추출.
     """
-    span = parent.find("span", class_=label_cls)
-    if not span:
+    span = parent.css_first(_SEL_LABEL_SPAN[label_cls])
+    if span is None:
         return ""
     # 다음 형제들 중 문자열 텍스트만 모아서 첫 유의미 텍스트 선택
-    for sib in span.next_siblings:
-        s = str(getattr(sib, "string", sib)).strip()
-        if s and s != ":" and s != "：" and s != "<br/>":
+    node = span.next
+    while node is not None:
+        s = node.text(deep=True).strip()
+        if s and s != ":" and s != "：":
             return s.replace("：", "").replace(":", "").strip()
+        node = node.next
     return ""
 
 def _count_star(score_box, li_cls: str) -> int:
-    target = score_box.find("li", class_=li_cls)
-    if not target:
-        return 0
-    lucky = target.find("p", class_="lucky-box")
-    if not lucky:
-        return 0
-    return len(lucky.find_all("img"))
+    # 셀렉터 한 번으로 li → lucky-box → img 체인을 해석
+    return len(score_box.css(_SEL_STAR_IMGS[li_cls]))
 
 # ---- 공개 함수 ----
-def fetch_html(url: str = URL, headless: bool = True) -> str:
-    """Selenium으로 HTML 받아오기."""
-    driver = _build_driver(headless=headless)
-    try:
-        driver.get(url)
-        time.sleep(2)
-        return driver.page_source
-    finally:
-        driver.quit()
+def fetch_html(url: str = URL, headless: bool = True, use_browser: bool = False) -> str:
+    """HTML 받아오기.
+
+    페이지가 서버 렌더링이라 기본은 단순 HTTP GET (Chrome 기동/2초 대기 불필요).
+    정적 응답에 필요한 구조가 없을 때만 브라우저(CDP) 폴백을 사용.
+    """
+    if not use_browser:
+        try:
+            res = httpx.get(url, timeout=15, headers=_UA_HEADERS, follow_redirects=True)
+            res.raise_for_status()
+            if _has_expected_structure(res.text):
+                return res.text
+        except httpx.HTTPError:
+            pass  # 폴백으로 진행
+
+    return asyncio.run(_fetch_html_browser(url, headless=headless))
+
+
+async def fetch_html_async(url: str = URL, headless: bool = True, use_browser: bool = False) -> str:
+    """fetch_html의 async 버전. 다른 I/O(카카오 토큰 갱신 등)와 겹쳐 돌릴 수 있다."""
+    if not use_browser:
+        try:
+            async with httpx.AsyncClient(
+                timeout=15, headers=_UA_HEADERS, follow_redirects=True
+            ) as client:
+                res = await client.get(url)
+            res.raise_for_status()
+            if _has_expected_structure(res.text):
+                return res.text
+        except httpx.HTTPError:
+            pass  # 폴백으로 진행
+
+    return await _fetch_html_browser(url, headless=headless)
+
 
+def parse_zodiac(html: str, target_id: str | None = None) -> pd.DataFrame:
+    """전체 12별자리 파싱. target_id(예: 'ousi')를 주면 상세는 그 박스만 파싱.
 
-def parse_zodiac(html: str) -> pd.DataFrame:
-    soup = BeautifulSoup(html, "html.parser")
-    rank_box = soup.find("ul", class_="rank-box")
-    detail = soup.find("div", class_="seiza-area")
+    랭킹은 순위 조회에 12개가 모두 필요하므로 항상 전체를 읽는다.
+    """
+    # pandas는 DataFrame 경로에서만 지연 import (dict 경로는 ~300ms/~60MB 절감)
+    import pandas as pd
+
+    tree = HTMLParser(html)  # selectolax: 단일 패스 C 파서, BeautifulSoup 대비 10배+ 빠름
+    rank_box = tree.css_first(_SEL_RANK_BOX)
+    detail = tree.css_first(_SEL_SEIZA_AREA)
 
     if rank_box is None or detail is None:
         raise ValueError("페이지 구조가 예상과 다릅니다. rank-box 또는 seiza-area를 찾을 수 없습니다.")
 
-    zodiak_kr_jp = {
-        "양자리": "おひつじ座", "황소자리": "おうし座", "쌍둥이자리": "ふたご座",
-        "게자리": "かに座", "사자자리": "しし座", "처녀자리": "おとめ座",
-        "천칭자리": "てんびん座", "전갈자리": "さそり座", "궁수자리": "いて座",
-        "염소자리": "やぎ座", "물병자리": "みずがめ座", "물고기자리": "うお座",
-    }
-    jp_to_kr = {v: k for k, v in zodiak_kr_jp.items()}
-    zodiak_eng = {
-        "ohitsuji": "양자리", "ousi": "황소자리", "futago": "쌍둥이자리",
-        "kani": "게자리", "sisi": "사자자리", "otome": "처녀자리",
-        "tenbin": "천칭자리", "sasori": "전갈자리", "ite": "궁수자리",
-        "yagi": "염소자리", "mizugame": "물병자리", "uo": "물고기자리",
-    }
-
     # 1) 랭킹
     ranking_rows = []
-    for i, li in enumerate(rank_box.find_all("li")[:12], start=1):
-        span = li.find("span")
-        jp_name = span.get_text(strip=True) if span else None
-        ranking_rows.append({"순위": i, "별자리_일본어": jp_name, "별자리_한국어": jp_to_kr.get(jp_name)})
+    for i, li in enumerate(rank_box.css("li")[:12], start=1):
+        span = li.css_first("span")
+        jp_name = span.text(strip=True) if span else None
+        ranking_rows.append({"순위": i, "별자리_일본어": jp_name, "별자리_한국어": _JP_TO_KR.get(jp_name)})
     ranking_df = pd.DataFrame(ranking_rows)
 
     # 2) 상세 (여기서 링크 추가)
-    detail_rows = []
-    for box in detail.find_all("div", class_="seiza-box")[:12]:
-        zid = box.get("id")                            # ex) "ousi"
-        kr_name = zodiak_eng.get(zid)
-        read_area = box.find("div", class_="read-area")
+    # 인라인 JSON이 있으면 12개 박스 DOM 탐색을 통째로 건너뜀
+    inline = _rows_from_inline_json(html)
+    if inline is not None:
+        detail_rows = [{
+            "별자리": _EID_TO_KR.get(entry["id"]),
+            "운세": entry.get("read", ""),
+            "행운의 색": entry.get("lucky_color", ""),
+            "행운의 물건": entry.get("key", ""),
+            "금전": int(entry.get("money", 0)),
+            "애정": int(entry.get("love", 0)),
+            "업무": int(entry.get("work", 0)),
+            "건강": int(entry.get("health", 0)),
+            "링크": f"{BASE_URL}#{entry['id']}",
+        } for entry in inline]
+        detail_df = pd.DataFrame(detail_rows)
+        return _merge_zodiac(ranking_df, detail_df)
+
+    # 컬럼별 리스트(SoA)로 모아 DataFrame을 한 번에 구성
+    # (행 dict 목록보다 dtype 추론이 싸고, 점수 컬럼이 바로 int로 잡힘)
+    names, reads, colors, keys, links = [], [], [], [], []
+    money, love, work, health = [], [], [], []
+    for box in detail.css(_SEL_SEIZA_BOX)[:12]:
+        zid = box.attributes.get("id")                 # ex) "ousi"
+        if target_id is not None and zid != target_id:
+            continue  # 11/12 박스의 _text_after_label/_count_star 체인 생략
+        read_area = box.css_first(_SEL_READ_AREA)
 
         read = ""
         if read_area:
-            p = read_area.find("p", class_="read")
-            read = p.get_text(strip=True) if p else ""
+            p = read_area.css_first(_SEL_READ)
+            read = p.text(strip=True) if p else ""
 
-        lucky_color = _text_after_label(read_area, "lucky-color-txt") if read_area else ""
-        key = _text_after_label(read_area, "key-txt") if read_area else ""
+        score = box.css_first(_SEL_SCORE_BOX)
 
-        score = box.find("div", class_="number-one-box")
+        names.append(_EID_TO_KR.get(zid))
+        reads.append(read)
+        colors.append(_text_after_label(read_area, "lucky-color-txt") if read_area else "")
+        keys.append(_text_after_label(read_area, "key-txt") if read_area else "")
+        money.append(_count_star(score, "lucky-money") if score else 0)
+        love.append(_count_star(score, "lucky-love") if score else 0)
+        work.append(_count_star(score, "lucky-work") if score else 0)
+        health.append(_count_star(score, "lucky-health") if score else 0)
+        links.append(f"{BASE_URL}#{zid}" if zid else "")  # ✅ 링크 구성
 
-        # ✅ 링크 구성
-        link = f"{BASE_URL}#{zid}" if zid else ""
+    detail_df = pd.DataFrame({
+        "별자리": names,
+        "운세": reads,
+        "행운의 색": colors,
+        "행운의 물건": keys,
+        "금전": money,
+        "애정": love,
+        "업무": work,
+        "건강": health,
+        "링크": links,
+    })
+    return _merge_zodiac(ranking_df, detail_df)
 
-        detail_rows.append({
-            "별자리": kr_name,
-            "운세": read,
-            "행운의 색": lucky_color,
-            "행운의 물건": key,
-            "금전": _count_star(score, "lucky-money") if score else 0,
-            "애정": _count_star(score, "lucky-love") if score else 0,
-            "업무": _count_star(score, "lucky-work") if score else 0,
-            "건강": _count_star(score, "lucky-health") if score else 0,
-            "링크": link,                        
-        })
-    detail_df = pd.DataFrame(detail_rows)
 
-    # 3) 병합
+def _merge_zodiac(ranking_df: pd.DataFrame, detail_df: pd.DataFrame) -> pd.DataFrame:
+    """랭킹/상세 DataFrame 병합 + 컬럼 정렬."""
+    import pandas as pd
+
     zodiak = pd.merge(
         ranking_df[["순위", "별자리_한국어"]],
         detail_df,
@@ -143,3 +303,72 @@ def get_zodiak_data(headless: bool = True) -> pd.DataFrame:
     """최종 오케스트레이션: HTML fetch → 파싱 → DataFrame 반환"""
     html = fetch_html(URL, headless=headless)
     return parse_zodiac(html)
+
+
+async def get_zodiak_data_async(headless: bool = True) -> pd.DataFrame:
+    """get_zodiak_data의 async 버전."""
+    html = await fetch_html_async(URL, headless=headless)
+    return parse_zodiac(html)
+
+
+def get_zodiak_dict(target: str, headless: bool = True) -> dict:
+    """단일 별자리 오케스트레이션: DataFrame 없이 dict 반환.
+
+    별자리 하나만 쓰는 호출자(카카오 전송 등)를 위해 12행 DataFrame
+    구성과 병합을 건너뛰고 target 박스만 파싱한다.
+    """
+    html = fetch_html(URL, headless=headless)
+    return _parse_zodiac_dict(html, target)
+
+
+async def get_zodiak_dict_async(target: str, headless: bool = True) -> dict:
+    """get_zodiak_dict의 async 버전."""
+    html = await fetch_html_async(URL, headless=headless)
+    return _parse_zodiac_dict(html, target)
+
+
+def _parse_zodiac_dict(html: str, target: str) -> dict:
+    """target 별자리 1개의 랭킹/상세만 파싱해 dict로 반환."""
+    zid = _KR_TO_EID.get(target)
+    if zid is None:
+        raise ValueError(f"알 수 없는 별자리: {target}")
+
+    tree = HTMLParser(html)
+    rank_box = tree.css_first(_SEL_RANK_BOX)
+    detail = tree.css_first(_SEL_SEIZA_AREA)
+
+    if rank_box is None or detail is None:
+        raise ValueError("페이지 구조가 예상과 다릅니다. rank-box 또는 seiza-area를 찾을 수 없습니다.")
+
+    # 랭킹에서 target 순위만 찾고 중단
+    rank = None
+    for i, li in enumerate(rank_box.css("li")[:12], start=1):
+        span = li.css_first("span")
+        jp_name = span.text(strip=True) if span else None
+        if _JP_TO_KR.get(jp_name) == target:
+            rank = i
+            break
+
+    for box in detail.css(_SEL_SEIZA_BOX)[:12]:
+        if box.attributes.get("id") != zid:
+            continue
+        read_area = box.css_first(_SEL_READ_AREA)
+        read = ""
+        if read_area:
+            p = read_area.css_first(_SEL_READ)
+            read = p.text(strip=True) if p else ""
+        score = box.css_first(_SEL_SCORE_BOX)
+        return {
+            "순위": rank,
+            "별자리": target,
+            "링크": f"{BASE_URL}#{zid}",
+            "운세": read,
+            "행운의 색": _text_after_label(read_area, "lucky-color-txt") if read_area else "",
+            "행운의 물건": _text_after_label(read_area, "key-txt") if read_area else "",
+            "금전": _count_star(score, "lucky-money") if score else 0,
+            "애정": _count_star(score, "lucky-love") if score else 0,
+            "업무": _count_star(score, "lucky-work") if score else 0,
+            "건강": _count_star(score, "lucky-health") if score else 0,
+        }
+
+    raise ValueError(f"'{target}'({zid}) 상세 박스를 찾을 수 없습니다.")